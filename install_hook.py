@@ -19,53 +19,81 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Template for the post-push hook script
-POST_PUSH_HOOK_TEMPLATE = """#!/bin/sh
+# Template for the post-push hook script. The hook runs directly on the
+# configured interpreter, without a shell in between.
+POST_PUSH_HOOK_TEMPLATE = """#!{python_exec}
 # JIRA Update Hook - Post-push hook
 
-# Get the previous and current HEAD
-previous_head="$1"
-current_head="$2"
-
-# Path to the Python executable (modify if needed)
-PYTHON_EXEC="{python_exec}"
+import os
+import sys
 
-# Path to the JIRA Update Hook script
-HOOK_SCRIPT="{hook_script}"
+# Make the JIRA Update Hook package importable
+sys.path.insert(0, {src_dir!r})
 
-# Path to the configuration file
-CONFIG_FILE="{config_file}"
+from jira_update.main import main_hook
 
-# Run the hook
-$PYTHON_EXEC $HOOK_SCRIPT --config $CONFIG_FILE --base-ref $previous_head --head-ref $current_head --repo-path "$(pwd)"
+# Get the previous and current HEAD
+previous_head = sys.argv[1]
+current_head = sys.argv[2]
 
-# Exit with the script's exit code
-exit $?
+# Run the hook and exit with its exit code
+sys.exit(main_hook(previous_head, current_head, os.getcwd(), {config_file!r}))
 """
 
 # Template for the post-commit hook script
-POST_COMMIT_HOOK_TEMPLATE = """#!/bin/sh
+POST_COMMIT_HOOK_TEMPLATE = """#!{python_exec}
 # JIRA Update Hook - Post-commit hook
 
-# Get the commit hash
-commit_hash=$(git rev-parse HEAD)
-previous_hash=$(git rev-parse HEAD~1)
+import os
+import sys
 
-# Path to the Python executable (modify if needed)
-PYTHON_EXEC="{python_exec}"
+# Make the JIRA Update Hook package importable
+sys.path.insert(0, {src_dir!r})
 
-# Path to the JIRA Update Hook script
-HOOK_SCRIPT="{hook_script}"
+from jira_update.main import main_hook
 
-# Path to the configuration file
-CONFIG_FILE="{config_file}"
+# Run the hook on the new commit and exit with its exit code
+sys.exit(main_hook('HEAD~1', 'HEAD', os.getcwd(), {config_file!r}))
+"""
 
-# Run the hook
-$PYTHON_EXEC $HOOK_SCRIPT --config $CONFIG_FILE --base-ref $previous_hash --head-ref $commit_hash --repo-path "$(pwd)"
 
-# Exit with the script's exit code
-exit $?
-"""
+def check_config(config_file: Path, src_dir: Path) -> None:
+    """
+    Report which JIRA instance and projects the hook will update.
+    
+    Only the JIRA URL and project keys are read from the configuration file.
+    Problems are logged as warnings and do not stop the installation.
+    
+    Args:
+        config_file: Path to the configuration file.
+        src_dir: Path to the package sources.
+    """
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    
+    try:
+        from jira_update.utils.config import Config, ConfigError
+    except ImportError as e:
+        logger.warning(f"Could not check the configuration file: {e}")
+        return
+    
+    try:
+        header = Config.load_header(str(config_file))
+    except ConfigError as e:
+        logger.warning(f"{e}. The hook will fail until this is fixed.")
+        return
+    
+    url = header['jira']['url']
+    keys = header['project']['keys']
+    if not url or not keys:
+        logger.warning(f"JIRA URL or project keys missing in {config_file}. The hook will fail until this is fixed.")
+        return
+    
+    if not isinstance(keys, list) or not all(isinstance(key, str) and key for key in keys):
+        logger.warning(f"Project keys in {config_file} must be a list of strings. The hook will fail until this is fixed.")
+        return
+    
+    logger.info(f"The hook will update {', '.join(keys)} tickets on {url}")
 
 
 def install_hook(target_repo: str, hook_type: str = 'post-push', config_file: str = 'config.yaml') -> bool:
@@ -107,26 +135,39 @@ def install_hook(target_repo: str, hook_type: str = 'post-push', config_file: st
         # Get the path to the Python executable
         python_exec = sys.executable
         
-        # Get the path to the hook script
-        script_dir = Path(__file__).parent
-        hook_script = script_dir / 'src' / 'jira_update' / 'main.py'
-        hook_script = hook_script.resolve()
+        # Get the path to the package sources
+        src_dir = (Path(__file__).parent / 'src').resolve()
         
         # Get the path to the configuration file
         config_file_path = Path(config_file).resolve()
+        check_config(config_file_path, src_dir)
         
         # Create the hook script
         hook_content = template.format(
             python_exec=python_exec,
-            hook_script=hook_script,
-            config_file=config_file_path
+            src_dir=str(src_dir),
+            config_file=str(config_file_path)
         )
         
-        with open(hook_file, 'w') as f:
-            f.write(hook_content)
+        hook_bytes = hook_content.encode()
+        exec_bits = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+        
+        # Leave an identical, executable hook untouched
+        if hook_file.exists() and hook_file.read_bytes() == hook_bytes:
+            mode = hook_file.stat().st_mode
+            if mode & exec_bits != exec_bits:
+                os.chmod(hook_file, mode | exec_bits)
+            logger.info(f"{hook_type} hook in {target_repo_path} is already up to date")
+            return True
+        
+        # Write to a temporary file and move it into place, so an interrupted
+        # install never leaves a partial hook behind
+        tmp_file = hook_file.with_suffix('.tmp')
+        tmp_file.write_bytes(hook_bytes)
         
         # Make the hook executable
-        os.chmod(hook_file, os.stat(hook_file).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        os.chmod(tmp_file, os.stat(tmp_file).st_mode | exec_bits)
+        os.replace(tmp_file, hook_file)
         
         logger.info(f"Successfully installed {hook_type} hook in {target_repo_path}")
         return True
@@ -7,9 +7,11 @@ from setuptools import setup, find_packages
 import os
 import re
 
+VERSION_RE = re.compile(r"^__version__ = ['\"]([^'\"]*)['\"]", re.M)
+
 # Read version from __init__.py
 with open(os.path.join('src', 'jira_update', '__init__.py'), 'r') as f:
-    version_match = re.search(r"^__version__ = ['\"]([^'\"]*)['\"]", f.read(), re.M)
+    version_match = VERSION_RE.search(f.read())
     if version_match:
         version = version_match.group(1)
     else:
@@ -32,7 +34,7 @@ setup(
     package_dir={'': 'src'},
     install_requires=[
         'jira>=3.5.0',
-        'gitpython>=3.1.30',
+        'pygit2>=1.12.0',
         'pyyaml>=6.0',
         'python-dotenv>=1.0.0',
         'requests>=2.31.0',
@@ -4,18 +4,135 @@ Code analyzer for JIRA Update Hook.
 
 import os
 import logging
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
 import fnmatch
 import re
 from pathlib import Path
+import shutil
 import subprocess
-from pygments import lexers
-from pygments.util import ClassNotFound
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
+from ..git.analyzer import Change
+from ..git.patch import PATCH_CONFIG, PATCH_OPTIONS, split_patch
 from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Header of a diff hunk
+_HUNK_RE = re.compile(rb'^@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@(.*)', re.MULTILINE)
+
+# Added, removed or context line within a hunk
+_HUNK_LINE_RE = re.compile(rb'^[-+ ].*', re.MULTILINE)
+
+# Resolved once instead of searching PATH on every git call
+_GIT = shutil.which('git') or 'git'
+
+# Upper bound for a snippet quoted in the AI prompt, whatever max_snippet_length is
+_MAX_PROMPT_SNIPPET_LENGTH = 500
+
+# Files that never yield a meaningful summary (binaries, bundles, lockfiles)
+_SKIP_SUFFIXES = (
+    '.lock', '.min.js', '.min.css', '.map',
+    '.png', '.jpg', '.jpeg', '.gif', '.ico', '.pdf', '.zip', '.gz', '.jar', '.bin'
+)
+_SKIP_BASENAMES = frozenset({'package-lock.json', 'yarn.lock', 'poetry.lock', 'Cargo.lock'})
+
+# Languages of common file extensions, checked before asking Pygments
+_LANGUAGE_MAP = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'React JSX',
+    '.tsx': 'React TSX',
+    '.java': 'Java',
+    '.c': 'C',
+    '.cpp': 'C++',
+    '.cs': 'C#',
+    '.go': 'Go',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.md': 'Markdown',
+    '.json': 'JSON',
+    '.xml': 'XML',
+    '.yaml': 'YAML',
+    '.yml': 'YAML',
+    '.sql': 'SQL',
+    '.sh': 'Shell',
+    '.bat': 'Batch',
+    '.ps1': 'PowerShell'
+}
+
+
+def _count_changes(hunk_body: bytes) -> Tuple[int, int]:
+    """
+    Count the added and removed lines of a hunk.
+    
+    Lines are counted with bytes.count() on their leading marker, so the
+    scan runs in C rather than as a Python loop over every line.
+    
+    Args:
+        hunk_body: Raw hunk following its header.
+        
+    Returns:
+        Tuple of (additions, deletions).
+    """
+    additions = hunk_body.count(b'\n+') + hunk_body.startswith(b'+')
+    deletions = hunk_body.count(b'\n-') + hunk_body.startswith(b'-')
+    return additions, deletions
+
+
+@lru_cache(maxsize=512)
+def _git_show_files(repo_path: str, commit_hash: str, file_paths: Tuple[str, ...]) -> Dict[str, bytes]:
+    """
+    Run a single git show for files of a commit and split it per file.
+    
+    Memoized so that commits analyzed again within the same process (e.g.
+    overlapping push ranges) don't spawn git again. Failures raise and are
+    therefore not cached.
+    
+    Args:
+        repo_path: Directory of the repository to run git in.
+        commit_hash: Hash of the commit.
+        file_paths: Paths of the files.
+        
+    Returns:
+        Dict mapping file paths to their raw diff output. Callers must not mutate it.
+        
+    Raises:
+        subprocess.CalledProcessError: If git fails.
+    """
+    cmd = [_GIT, *PATCH_CONFIG, 'show', '--format=', '--patch', *PATCH_OPTIONS, commit_hash, '--', *file_paths]
+    # Keep the output as bytes, only the snippets that end up in comments get decoded
+    result = subprocess.run(cmd, cwd=repo_path, capture_output=True, check=True)
+    
+    return split_patch(result.stdout)
+
+
+@lru_cache(maxsize=256)
+def _detect_language_by_name(file_name: str) -> str:
+    """
+    Detect the programming language of a file name using Pygments.
+    
+    Args:
+        file_name: Base name of the file.
+        
+    Returns:
+        String representing the language.
+    """
+    # Pygments is only imported for extensions missing from _LANGUAGE_MAP
+    from pygments import lexers
+    from pygments.util import ClassNotFound
+    
+    try:
+        return lexers.get_lexer_for_filename(file_name).name
+    except ClassNotFound:
+        return 'Unknown'
+
 
 class CodeAnalyzer:
     """Analyzes code changes to generate meaningful summaries."""
@@ -23,29 +140,46 @@ class CodeAnalyzer:
     def __init__(self):
         """Initialize the code analyzer using configuration settings."""
         self.config = get_config()
-        self.detail_level = self.config.get('analysis', 'detail_level', 'detailed')
-        self.max_files = self.config.get('analysis', 'max_files', 5)
-        self.max_changes_per_file = self.config.get('analysis', 'max_changes_per_file', 3)
-        self.include_snippets = self.config.get('analysis', 'include_snippets', True)
-        self.max_snippet_length = self.config.get('analysis', 'max_snippet_length', 100)
+        analysis_config = self.config.get_section('analysis')
+        self.detail_level = analysis_config.get('detail_level', 'detailed')
+        self.max_files = analysis_config.get('max_files', 5)
+        self.max_changes_per_file = analysis_config.get('max_changes_per_file', 3)
+        self.include_snippets = analysis_config.get('include_snippets', True)
+        self.max_snippet_length = analysis_config.get('max_snippet_length', 100)
+        self.min_total_changes = analysis_config.get('min_total_changes', 0)
         
         # Optional AI-powered summary
-        self.use_ai_summary = self.config.get('advanced', 'use_ai_summary', False)
+        advanced_config = self.config.get_section('advanced')
+        self.use_ai_summary = advanced_config.get('use_ai_summary', False)
+        self._openai_client = None
         if self.use_ai_summary:
-            try:
-                import openai
-                api_key_env = self.config.get('advanced', 'openai', {}).get('api_key_env', 'OPENAI_API_KEY')
-                openai.api_key = os.environ.get(api_key_env)
-                self.openai_model = self.config.get('advanced', 'openai', {}).get('model', 'gpt-3.5-turbo')
-                self.openai_available = bool(openai.api_key)
-                if not self.openai_available:
-                    logger.warning(f"OpenAI API key not found in environment variable {api_key_env}")
-            except ImportError:
-                logger.warning("OpenAI module not available. AI-powered summaries disabled.")
-                self.openai_available = False
+            openai_config = advanced_config.get('openai', {})
+            api_key_env = openai_config.get('api_key_env', 'OPENAI_API_KEY')
+            self._openai_api_key = os.environ.get(api_key_env)
+            self.openai_model = openai_config.get('model', 'gpt-3.5-turbo')
+            self.openai_available = bool(self._openai_api_key)
+            if not self.openai_available:
+                logger.warning(f"OpenAI API key not found in environment variable {api_key_env}")
         else:
             self.openai_available = False
 
+    def _get_openai_client(self):
+        """
+        Get the OpenAI client, importing openai and creating the client on first use.
+        
+        One client is kept per analyzer so its connection pool is reused across commits.
+        
+        Returns:
+            OpenAI client instance.
+            
+        Raises:
+            ImportError: If the openai module is not installed.
+        """
+        if self._openai_client is None:
+            from openai import OpenAI
+            self._openai_client = OpenAI(api_key=self._openai_api_key)
+        return self._openai_client
+
     def analyze_changes(self, commit_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze code changes in a commit.
@@ -54,24 +188,47 @@ class CodeAnalyzer:
             commit_analysis: Dict containing commit analysis from GitAnalyzer.
             
         Returns:
-            Dict with enhanced analysis including code insights.
+            Dict with enhanced analysis including code insights. Commits
+            without changes are returned as is.
         """
+        # Skip if no changes, there is nothing to add
+        if not commit_analysis.get('changes'):
+            return commit_analysis
+        
         # Make a copy to avoid modifying the original
-        enhanced_analysis = commit_analysis.copy()
+        enhanced_analysis = {**commit_analysis}
         
-        # Skip if no changes
-        if not commit_analysis.get('changes'):
-            return enhanced_analysis
+        # Skip file analysis for trivial commits
+        if self.min_total_changes:
+            total_changes = sum(
+                change.insertions + change.deletions
+                for change in commit_analysis['changes']
+            )
+            if total_changes < self.min_total_changes:
+                enhanced_analysis['detailed_summary'] = f"Trivial commit ({total_changes} lines changed)."
+                return enhanced_analysis
         
         # Get the most significant files
         significant_files = self._get_significant_files(commit_analysis['changes'])
         
-        # Analyze each significant file
-        file_analyses = []
-        for file_info in significant_files:
-            file_analysis = self._analyze_file(file_info, commit_analysis['hash'])
-            if file_analysis:
-                file_analyses.append(file_analysis)
+        # Use the diffs preloaded for the whole push, or fetch the diffs of
+        # all significant files with a single git call
+        file_diffs = commit_analysis.get('file_diffs')
+        if file_diffs is None:
+            diff_paths = [f.path for f in significant_files if f.type != 'deleted']
+            file_diffs = self._get_files_diff(diff_paths, commit_analysis['hash'])
+        
+        # Analyze each significant file, in parallel when there are several
+        def analyze(file_info):
+            return self._analyze_file(file_info, file_diffs.get(file_info.path))
+        
+        if len(significant_files) > 1:
+            max_workers = min(len(significant_files), os.cpu_count() or 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(analyze, significant_files))
+        else:
+            results = [analyze(file_info) for file_info in significant_files]
+        file_analyses = [file_analysis for file_analysis in results if file_analysis]
         
         # Generate detailed summary
         detailed_summary = self._generate_detailed_summary(file_analyses, commit_analysis)
@@ -88,39 +245,46 @@ class CodeAnalyzer:
         
         return enhanced_analysis
 
-    def _get_significant_files(self, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _get_significant_files(self, changes: List[Change]) -> List[Change]:
         """
         Get the most significant files from the changes.
         
         Args:
-            changes: List of change dictionaries.
+            changes: List of changes.
             
         Returns:
-            List of significant file dictionaries.
+            List of the most significant changes.
         """
+        # Drop files that cannot be summarized so they don't take a slot
+        candidates = [
+            change for change in changes
+            if os.path.basename(change.path) not in _SKIP_BASENAMES
+            and not change.path.lower().endswith(_SKIP_SUFFIXES)
+        ]
+        
         # Sort changes by significance (total lines changed)
         sorted_changes = sorted(
-            changes,
-            key=lambda x: x.get('insertions', 0) + x.get('deletions', 0),
+            candidates,
+            key=lambda x: x.insertions + x.deletions,
             reverse=True
         )
         
         # Limit to max_files
         return sorted_changes[:self.max_files]
 
-    def _analyze_file(self, file_info: Dict[str, Any], commit_hash: str) -> Optional[Dict[str, Any]]:
+    def _analyze_file(self, file_info: Change, diff_output: Optional[bytes]) -> Optional[Dict[str, Any]]:
         """
         Analyze a single file change.
         
         Args:
-            file_info: Dict containing file change information.
-            commit_hash: Hash of the commit.
+            file_info: Change of the file.
+            diff_output: Raw diff of the file in the commit, if available.
             
         Returns:
             Dict with file analysis or None if analysis fails.
         """
-        file_path = file_info['path']
-        change_type = file_info['type']
+        file_path = file_info.path
+        change_type = file_info.type
         
         # Skip analysis for deleted files
         if change_type == 'deleted':
@@ -130,24 +294,18 @@ class CodeAnalyzer:
                 'language': self._detect_language(file_path),
                 'summary': "File was deleted",
                 'insertions': 0,
-                'deletions': file_info.get('deletions', 0)
+                'deletions': file_info.deletions
             }
         
         # Get file language
         language = self._detect_language(file_path)
         
-        # Get the diff for the file
-        diff_output = self._get_file_diff(file_path, commit_hash)
-        if not diff_output:
+        if not diff_output or b'\nBinary files ' in diff_output:
             return None
         
-        # Parse the diff to extract changed sections
+        # Parse the diff to extract the most significant changed sections
         changed_sections = self._parse_diff(diff_output)
         
-        # Limit to most significant changes
-        if len(changed_sections) > self.max_changes_per_file:
-            changed_sections = changed_sections[:self.max_changes_per_file]
-        
         # Generate file summary
         file_summary = self._generate_file_summary(file_path, change_type, changed_sections, language)
         
@@ -157,8 +315,8 @@ class CodeAnalyzer:
             'language': language,
             'summary': file_summary,
             'changed_sections': changed_sections,
-            'insertions': file_info.get('insertions', 0),
-            'deletions': file_info.get('deletions', 0)
+            'insertions': file_info.insertions,
+            'deletions': file_info.deletions
         }
 
     def _detect_language(self, file_path: str) -> str:
@@ -171,131 +329,107 @@ class CodeAnalyzer:
         Returns:
             String representing the language.
         """
-        try:
-            lexer = lexers.get_lexer_for_filename(file_path)
-            return lexer.name
-        except ClassNotFound:
-            # Try to guess based on extension
-            ext = os.path.splitext(file_path)[1].lower()
-            language_map = {
-                '.py': 'Python',
-                '.js': 'JavaScript',
-                '.ts': 'TypeScript',
-                '.jsx': 'React JSX',
-                '.tsx': 'React TSX',
-                '.java': 'Java',
-                '.c': 'C',
-                '.cpp': 'C++',
-                '.cs': 'C#',
-                '.go': 'Go',
-                '.rb': 'Ruby',
-                '.php': 'PHP',
-                '.html': 'HTML',
-                '.css': 'CSS',
-                '.scss': 'SCSS',
-                '.md': 'Markdown',
-                '.json': 'JSON',
-                '.xml': 'XML',
-                '.yaml': 'YAML',
-                '.yml': 'YAML',
-                '.sql': 'SQL',
-                '.sh': 'Shell',
-                '.bat': 'Batch',
-                '.ps1': 'PowerShell'
-            }
-            return language_map.get(ext, 'Unknown')
+        ext = os.path.splitext(file_path)[1].lower()
+        language = _LANGUAGE_MAP.get(ext)
+        if language:
+            return language
+        return _detect_language_by_name(os.path.basename(file_path))
 
-    def _get_file_diff(self, file_path: str, commit_hash: str) -> Optional[str]:
+    def _get_files_diff(self, file_paths: List[str], commit_hash: str) -> Dict[str, bytes]:
         """
-        Get the diff for a file in a commit.
+        Get the diffs for several files in a commit using a single git call.
         
         Args:
-            file_path: Path to the file.
+            file_paths: Paths of the files.
             commit_hash: Hash of the commit.
             
         Returns:
-            String containing the diff output or None if it fails.
+            Dict mapping file paths to their raw diff output. Files whose diff
+            could not be retrieved are missing from the result.
         """
+        if not file_paths:
+            return {}
+        
         try:
-            # Get the diff for the file
-            cmd = ['git', 'show', '--format=', '--patch', f'{commit_hash}^..{commit_hash}', '--', file_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return result.stdout
+            return _git_show_files(os.getcwd(), commit_hash, tuple(file_paths))
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error getting diff for {file_path} in commit {commit_hash}: {e}")
-            return None
+            logger.error(f"Error getting diffs for commit {commit_hash}: {e}")
+            return {}
         except Exception as e:
-            logger.error(f"Unexpected error getting diff for {file_path}: {e}")
-            return None
+            logger.error(f"Unexpected error getting diffs for commit {commit_hash}: {e}")
+            return {}
 
-    def _parse_diff(self, diff_output: str) -> List[Dict[str, Any]]:
+    def _parse_diff(self, diff_output: bytes) -> List[Dict[str, Any]]:
         """
         Parse a diff output to extract changed sections.
         
+        Parsing stops once max_changes_per_file sections have been collected.
+        
         Args:
-            diff_output: String containing the diff output.
+            diff_output: Raw diff output.
             
         Returns:
             List of dictionaries containing changed section information.
         """
         changed_sections = []
-        
-        # Regular expression to find diff hunks
-        hunk_pattern = re.compile(r'@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@(.*)')
-        
-        lines = diff_output.split('\n')
-        current_hunk = None
-        hunk_lines = []
-        
-        for line in lines:
-            # Check for hunk header
-            match = hunk_pattern.match(line)
-            if match:
-                # Save previous hunk if exists
-                if current_hunk and hunk_lines:
-                    snippet = '\n'.join(hunk_lines)
-                    if len(snippet) > self.max_snippet_length:
-                        snippet = snippet[:self.max_snippet_length] + '...'
-                    
-                    changed_sections.append({
-                        'old_start': current_hunk[0],
-                        'old_count': current_hunk[1],
-                        'new_start': current_hunk[2],
-                        'new_count': current_hunk[3],
-                        'header': current_hunk[4].strip(),
-                        'snippet': snippet if self.include_snippets else None
-                    })
-                
-                # Start new hunk
-                old_start = int(match.group(1))
-                old_count = int(match.group(2)) if match.group(2) else 1
-                new_start = int(match.group(3))
-                new_count = int(match.group(4)) if match.group(4) else 1
-                header = match.group(5)
-                
-                current_hunk = (old_start, old_count, new_start, new_count, header)
-                hunk_lines = []
-            elif current_hunk:
-                # Add line to current hunk
-                if line.startswith('+') or line.startswith('-') or line.startswith(' '):
-                    hunk_lines.append(line)
+        previous = None
+        
+        # Each hunk body runs from the end of its header to the next header
+        for match in _HUNK_RE.finditer(diff_output):
+            if previous is not None:
+                section = self._make_section(previous, diff_output[previous.end() + 1:match.start()])
+                if section:
+                    changed_sections.append(section)
+                    if len(changed_sections) >= self.max_changes_per_file:
+                        return changed_sections
+            previous = match
         
         # Add the last hunk
-        if current_hunk and hunk_lines:
-            snippet = '\n'.join(hunk_lines)
+        if previous is not None:
+            section = self._make_section(previous, diff_output[previous.end() + 1:])
+            if section:
+                changed_sections.append(section)
+        
+        return changed_sections
+
+    def _make_section(self, match: re.Match, body: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Build a changed section from a hunk.
+        
+        Args:
+            match: Match of the hunk header.
+            body: Raw hunk following its header.
+            
+        Returns:
+            Dict containing changed section information or None if the hunk has no changed lines.
+        """
+        if not _HUNK_LINE_RE.search(body):
+            return None
+        
+        snippet = None
+        if self.include_snippets:
+            if b'\n\\' in body or body.startswith(b'\\'):
+                # Drop "\ No newline at end of file" markers
+                body = b'\n'.join(_HUNK_LINE_RE.findall(body))
+            # Hunk lines are never empty, so a slice just past the limit is
+            # enough; UTF-8 needs at most 4 bytes per character
+            limit = self.max_snippet_length + 2
+            snippet = body[:4 * limit].decode('utf-8', 'replace')[:limit].rstrip('\n')
             if len(snippet) > self.max_snippet_length:
                 snippet = snippet[:self.max_snippet_length] + '...'
-            
-            changed_sections.append({
-                'old_start': current_hunk[0],
-                'old_count': current_hunk[1],
-                'new_start': current_hunk[2],
-                'new_count': current_hunk[3],
-                'header': current_hunk[4].strip(),
-                'snippet': snippet if self.include_snippets else None
-            })
         
-        return changed_sections
+        additions, deletions = _count_changes(body)
+        
+        return {
+            'old_start': int(match.group(1)),
+            'old_count': int(match.group(2)) if match.group(2) else 1,
+            'new_start': int(match.group(3)),
+            'new_count': int(match.group(4)) if match.group(4) else 1,
+            'header': match.group(5).decode('utf-8', 'replace').strip(),
+            'snippet': snippet,
+            'additions': additions,
+            'deletions': deletions
+        }
 
     def _generate_file_summary(self, file_path: str, change_type: str, 
                               changed_sections: List[Dict[str, Any]], language: str) -> str:
@@ -323,10 +457,11 @@ class CodeAnalyzer:
             return f"Renamed file to {file_name}"
         
         else:  # modified
-            total_additions = sum(len([l for l in section.get('snippet', '').split('\n') if l.startswith('+')]) 
-                                for section in changed_sections)
-            total_deletions = sum(len([l for l in section.get('snippet', '').split('\n') if l.startswith('-')]) 
-                               for section in changed_sections)
+            total_additions = 0
+            total_deletions = 0
+            for section in changed_sections:
+                total_additions += section['additions']
+                total_deletions += section['deletions']
             
             if self.detail_level == 'basic':
                 return f"Modified {language} file with {total_additions} additions and {total_deletions} deletions"
@@ -365,16 +500,16 @@ class CodeAnalyzer:
         
         # Add overall summary
         total_files = len(file_analyses)
-        total_insertions = sum(file.get('insertions', 0) for file in file_analyses)
-        total_deletions = sum(file.get('deletions', 0) for file in file_analyses)
+        total_insertions = 0
+        total_deletions = 0
+        for file in file_analyses:
+            total_insertions += file.get('insertions', 0)
+            total_deletions += file.get('deletions', 0)
         
         summary_lines.append(f"Changed {total_files} files with {total_insertions} additions and {total_deletions} deletions.")
         
         # Group files by type
-        file_types = {}
-        for file in file_analyses:
-            language = file.get('language', 'Unknown')
-            file_types[language] = file_types.get(language, 0) + 1
+        file_types = Counter(file.get('language', 'Unknown') for file in file_analyses)
         
         if len(file_types) > 1:
             file_type_summary = ", ".join(f"{count} {lang}" for lang, count in file_types.items())
@@ -405,32 +540,32 @@ class CodeAnalyzer:
             return None
         
         try:
-            import openai
-            
             # Prepare the prompt
-            prompt = f"""
+            parts = [f"""
             Summarize the following code changes in a concise, technical manner:
             
             Commit message: {commit_analysis.get('message', '')}
             
             Files changed:
-            """
+            """]
             
             for file in file_analyses:
-                prompt += f"\n- {file.get('path', '')}: {file.get('summary', '')}"
+                path = file.get('path', '')
+                parts.append(f"\n- {path}: {file.get('summary', '')}")
                 
                 # Add snippets if available
                 if self.include_snippets and 'changed_sections' in file:
-                    for i, section in enumerate(file['changed_sections']):
-                        if i >= 2:  # Limit to 2 sections per file to keep prompt size reasonable
-                            break
-                        if 'snippet' in section:
-                            prompt += f"\n\nSnippet from {file.get('path', '')}:\n```\n{section['snippet']}\n```"
+                    # Limit to 2 sections per file to keep prompt size reasonable
+                    for section in file['changed_sections'][:2]:
+                        snippet = section.get('snippet')
+                        if snippet:
+                            parts.append(f"\n\nSnippet from {path}:\n```\n{snippet[:_MAX_PROMPT_SNIPPET_LENGTH]}\n```")
             
-            prompt += "\n\nProvide a technical summary of what these changes accomplish and their potential impact."
+            parts.append("\n\nProvide a technical summary of what these changes accomplish and their potential impact.")
+            prompt = "".join(parts)
             
             # Call the OpenAI API
-            response = openai.ChatCompletion.create(
+            response = self._get_openai_client().chat.completions.create(
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": "You are a technical code reviewer who provides concise, accurate summaries of code changes."},
@@ -445,6 +580,10 @@ class CodeAnalyzer:
             logger.info("Generated AI-powered summary")
             return summary
             
+        except ImportError:
+            logger.warning("OpenAI module not available. AI-powered summaries disabled.")
+            self.openai_available = False
+            return None
         except Exception as e:
             logger.error(f"Error generating AI summary: {e}")
             return None 
\ No newline at end of file
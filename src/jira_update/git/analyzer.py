@@ -4,16 +4,60 @@ Git commit analyzer for JIRA Update Hook.
 
 import re
 import logging
-from typing import List, Dict, Any, Set, Optional, Tuple
+from typing import List, Dict, Any, Set, Optional, Tuple, Iterator, Iterable, NamedTuple
 import os
 from pathlib import Path
 import fnmatch
-import git
+import subprocess
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import cached_property, partial
+from itertools import islice
+import pygit2
 
+from .patch import PATCH_CONFIG, PATCH_OPTIONS, split_patch
+from ..utils.cache import atomic_write, cache_key, get_cache_dir
 from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of threads analyzing the commits of a push
+MAX_ANALYSIS_WORKERS = 8
+
+# Maximum number of processed commits remembered per repository
+MAX_SEEN_COMMITS = 100000
+
+# Default regex for JIRA ticket IDs
+DEFAULT_TICKET_PATTERN = r'([A-Z]+-\d+)'
+
+# Characters with a special meaning in fnmatch patterns
+_GLOB_CHARS_RE = re.compile(r'[*?\[]')
+
+# Host and repository path of a remote URL, either scheme://[user@]host[:port]/path
+# (e.g. https://github.com/owner/repo.git) or scp-like [user@]host:path
+# (e.g. git@github.com:owner/repo.git). Only URLs with a scheme can have a
+# port, an all-digit owner in scp-like URLs is part of the path.
+_REMOTE_URL_RE = re.compile(
+    r'^(?:[a-z][a-z0-9+.-]*://(?:[^@/]+@)?([^/:]+)(?::\d+)?/|(?:[^@/]+@)?([^/:]+):)(.+?)(?:\.git)?/?$'
+)
+
+# Commit URL prefix by hosting service
+_COMMIT_URL_TEMPLATES = {
+    'github.com': 'https://github.com/{repo}/commit/',
+    'gitlab.com': 'https://gitlab.com/{repo}/-/commit/',
+    'bitbucket.org': 'https://bitbucket.org/{repo}/commits/',
+}
+
+
+class Change(NamedTuple):
+    """A file changed by a commit."""
+    type: str
+    path: str
+    insertions: int
+    deletions: int
+
 
 class GitAnalyzer:
     """Analyzes Git commits to extract JIRA ticket IDs and code changes."""
@@ -26,21 +70,79 @@ class GitAnalyzer:
             repo_path: Path to the Git repository. If None, uses the current directory.
         """
         self.repo_path = repo_path or os.getcwd()
-        self.repo = git.Repo(self.repo_path)
+        self.repo = pygit2.Repository(self.repo_path)
         self.config = get_config()
         
+        # libgit2 repositories must not be shared between threads
+        self._local = threading.local()
+        self._local.repo = self.repo
+        
         # Compile the regex pattern for extracting JIRA ticket IDs
-        pattern = self.config.get('project', 'ticket_pattern', r'([A-Z]+-\d+)')
+        pattern = self.config.get('project', 'ticket_pattern', DEFAULT_TICKET_PATTERN)
+        project_keys = self.config.get('project', 'keys', [])
+        self._project_key_re = None
+        if pattern == DEFAULT_TICKET_PATTERN:
+            # Only match the configured projects, no filtering needed afterwards.
+            # Matches start at the beginning of an uppercase run only, so long
+            # uppercase text without tickets is scanned without backtracking.
+            keys = '|'.join(map(re.escape, project_keys)) if project_keys else '[A-Z]+'
+            pattern = rf'(?<![A-Z])((?:{keys})-\d+)'
+        elif project_keys:
+            self._project_key_re = re.compile('(?:{})-'.format('|'.join(map(re.escape, project_keys))))
         self.ticket_pattern = re.compile(pattern)
         
-        # Get ignore patterns
+        # Get ignore patterns and precompile them for should_ignore_file
         self.ignore_patterns = self.config.get('git', 'ignore_patterns', [])
+        self._compile_ignore_patterns()
         
         # Get max commits to analyze
         self.max_commits = self.config.get('git', 'max_commits', 10)
         
         # Whether to analyze merge commits
         self.analyze_merges = self.config.get('git', 'analyze_merges', False)
+        
+        # Commits already processed by earlier runs, oldest first
+        self.skip_processed = self.config.get('git', 'skip_processed_commits', True)
+        repo_id = cache_key(os.path.realpath(self.repo.path))
+        self._seen_file = os.path.join(get_cache_dir('repos', repo_id), 'seen.txt')
+        self._seen = self._load_seen() if self.skip_processed else OrderedDict()
+
+    def _load_seen(self) -> 'OrderedDict[str, None]':
+        """
+        Load the hashes of commits processed by earlier runs.
+        
+        Returns:
+            Ordered dict of commit hashes, oldest first.
+        """
+        try:
+            with open(self._seen_file, 'r') as f:
+                return OrderedDict.fromkeys(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            return OrderedDict()
+        except OSError as e:
+            logger.warning(f"Could not read processed commits cache: {e}")
+            return OrderedDict()
+
+    def mark_processed(self, commit_hashes: Iterable[str]):
+        """
+        Remember commits as processed so later pushes skip them.
+        
+        Args:
+            commit_hashes: Hashes of the processed commits.
+        """
+        if not self.skip_processed:
+            return
+        
+        for commit_hash in commit_hashes:
+            self._seen[commit_hash] = None
+            self._seen.move_to_end(commit_hash)
+        while len(self._seen) > MAX_SEEN_COMMITS:
+            self._seen.popitem(last=False)
+        
+        try:
+            atomic_write(self._seen_file, ''.join(f"{commit_hash}\n" for commit_hash in self._seen).encode())
+        except OSError as e:
+            logger.warning(f"Could not write processed commits cache: {e}")
 
     def extract_ticket_ids(self, commit_message: str) -> List[str]:
         """
@@ -50,22 +152,36 @@ class GitAnalyzer:
             commit_message: The commit message to analyze.
             
         Returns:
-            List of JIRA ticket IDs found in the commit message.
+            List of unique JIRA ticket IDs found in the commit message, in order of appearance.
         """
         matches = self.ticket_pattern.findall(commit_message)
         
-        # Filter by project keys if configured
-        project_keys = self.config.get('project', 'keys', [])
-        if project_keys:
-            filtered_matches = []
-            for match in matches:
-                for key in project_keys:
-                    if match.startswith(key + '-'):
-                        filtered_matches.append(match)
-                        break
-            return filtered_matches
-        
-        return matches
+        # Filter by project keys if a custom pattern is configured
+        if self._project_key_re:
+            matches = [match for match in matches if self._project_key_re.match(match)]
+        
+        return list(dict.fromkeys(matches))
+
+    def _compile_ignore_patterns(self):
+        """
+        Split the ignore patterns into literal names, "*.ext"-style suffixes
+        and a single regex for the remaining globs.
+        """
+        literals = set()
+        suffixes = []
+        globs = []
+        for pattern in self.ignore_patterns:
+            if not _GLOB_CHARS_RE.search(pattern):
+                literals.add(pattern)
+            elif pattern.startswith('*') and not _GLOB_CHARS_RE.search(pattern[1:]):
+                # "*" also matches "/", so this is a plain suffix test
+                suffixes.append(pattern[1:])
+            else:
+                globs.append(pattern)
+        
+        self._ignore_literals = frozenset(literals)
+        self._ignore_suffixes = tuple(suffixes)
+        self._ignore_re = re.compile('|'.join(fnmatch.translate(p) for p in globs)) if globs else None
 
     def should_ignore_file(self, file_path: str) -> bool:
         """
@@ -77,22 +193,25 @@ class GitAnalyzer:
         Returns:
             True if the file should be ignored, False otherwise.
         """
-        for pattern in self.ignore_patterns:
-            if fnmatch.fnmatch(file_path, pattern):
-                return True
-        return False
+        if file_path in self._ignore_literals:
+            return True
+        if self._ignore_suffixes and file_path.endswith(self._ignore_suffixes):
+            return True
+        return self._ignore_re is not None and self._ignore_re.match(file_path) is not None
 
-    def analyze_commit(self, commit_hash: str) -> Dict[str, Any]:
+    def analyze_commit(self, commit_hash: str, compute_summary: bool = True) -> Dict[str, Any]:
         """
         Analyze a single commit.
         
         Args:
             commit_hash: Hash of the commit to analyze.
+            compute_summary: Whether to generate the basic summary. Callers
+                that add their own summary (e.g. CodeAnalyzer) can skip it.
             
         Returns:
             Dict containing commit analysis results.
         """
-        commit = self.repo.commit(commit_hash)
+        commit = self._resolve_commit(commit_hash)
         
         # Skip merge commits if configured
         if not self.analyze_merges and len(commit.parents) > 1:
@@ -108,79 +227,126 @@ class GitAnalyzer:
         # Extract ticket IDs from commit message
         ticket_ids = self.extract_ticket_ids(commit.message)
         
-        # Analyze changes
+        # Diff against the first parent natively in libgit2, with rename detection
+        if commit.parents:
+            diff = self._get_thread_repo().diff(commit.parents[0], commit)
+        else:
+            diff = commit.tree.diff_to_tree(swap=True)
+        diff.find_similar()
+        
+        # Analyze changes, generating patches only for files that are not ignored
         changes = []
-        for diff in commit.parents[0].diff(commit):
+        for index, delta in enumerate(diff.deltas):
             # Skip ignored files
-            if diff.a_path and self.should_ignore_file(diff.a_path):
+            if self.should_ignore_file(delta.old_file.path):
                 continue
-            if diff.b_path and self.should_ignore_file(diff.b_path):
+            if self.should_ignore_file(delta.new_file.path):
                 continue
             
-            change_type = self._get_change_type(diff)
-            
-            change = {
-                'type': change_type,
-                'path': diff.b_path or diff.a_path,
-                'insertions': diff.stats.get('insertions', 0),
-                'deletions': diff.stats.get('deletions', 0)
-            }
+            change_type = self._get_change_type(delta)
+            _, insertions, deletions = diff[index].line_stats
             
-            changes.append(change)
+            changes.append(Change(change_type, delta.new_file.path, insertions, deletions))
         
-        # Generate summary
-        summary = self._generate_summary(commit, changes)
+        committer_tz = timezone(timedelta(minutes=commit.commit_time_offset))
+        committed_datetime = datetime.fromtimestamp(commit.commit_time, committer_tz)
         
-        return {
+        analysis = {
             'hash': commit_hash,
             'author': f"{commit.author.name} <{commit.author.email}>",
-            'date': commit.committed_datetime.isoformat(),
+            'date': committed_datetime.isoformat(),
             'message': commit.message,
             'is_merge': len(commit.parents) > 1,
             'ticket_ids': ticket_ids,
-            'changes': changes,
-            'summary': summary
+            'changes': changes
         }
+        
+        # Generate summary
+        if compute_summary:
+            analysis['summary'] = self._generate_summary(commit, changes)
+        
+        return analysis
 
-    def _get_change_type(self, diff) -> str:
+    def _scan_ticket_ids(self, commit: pygit2.Commit) -> List[str]:
         """
-        Get the type of change for a diff.
+        Extract the JIRA ticket IDs from the message of a commit.
         
         Args:
-            diff: GitPython diff object.
+            commit: pygit2 commit object.
+            
+        Returns:
+            List of JIRA ticket IDs, empty for skipped merge commits.
+        """
+        if not self.analyze_merges and len(commit.parents) > 1:
+            return []
+        return self.extract_ticket_ids(commit.message)
+
+    def _resolve_commit(self, ref: str) -> pygit2.Commit:
+        """
+        Resolve a commit hash or reference to a commit.
+        
+        Args:
+            ref: Commit hash or any revision understood by git (e.g. HEAD~1).
+            
+        Returns:
+            pygit2 commit object.
+        """
+        return self._get_thread_repo().revparse_single(ref).peel(pygit2.Commit)
+
+    def _get_thread_repo(self) -> pygit2.Repository:
+        """
+        Get the repository handle of the current thread, opening one if needed.
+        
+        Returns:
+            pygit2 repository owned by the calling thread.
+        """
+        repo = getattr(self._local, 'repo', None)
+        if repo is None:
+            repo = pygit2.Repository(self.repo_path)
+            self._local.repo = repo
+        return repo
+
+    def _get_change_type(self, delta) -> str:
+        """
+        Get the type of change for a diff delta.
+        
+        Args:
+            delta: pygit2 diff delta.
             
         Returns:
             String describing the change type.
         """
-        if diff.new_file:
+        if delta.status == pygit2.GIT_DELTA_ADDED:
             return 'added'
-        elif diff.deleted_file:
+        elif delta.status == pygit2.GIT_DELTA_DELETED:
             return 'deleted'
-        elif diff.renamed:
+        elif delta.status == pygit2.GIT_DELTA_RENAMED:
             return 'renamed'
         else:
             return 'modified'
 
-    def _generate_summary(self, commit, changes: List[Dict[str, Any]]) -> str:
+    def _generate_summary(self, commit, changes: List[Change]) -> str:
         """
         Generate a summary of the commit changes.
         
         Args:
-            commit: GitPython commit object.
-            changes: List of change dictionaries.
+            commit: pygit2 commit object.
+            changes: List of changes.
             
         Returns:
             Summary string.
         """
         total_files = len(changes)
-        total_insertions = sum(change['insertions'] for change in changes)
-        total_deletions = sum(change['deletions'] for change in changes)
-        
-        file_types = {}
+        total_insertions = 0
+        total_deletions = 0
+        extensions = []
+        splitext = os.path.splitext
         for change in changes:
-            ext = os.path.splitext(change['path'])[1]
-            if ext:
-                file_types[ext] = file_types.get(ext, 0) + 1
+            total_insertions += change.insertions
+            total_deletions += change.deletions
+            extensions.append(splitext(change.path)[1])
+        
+        file_types = Counter(filter(None, extensions))
         
         summary_lines = [
             f"Changed {total_files} files with {total_insertions} additions and {total_deletions} deletions.",
@@ -193,46 +359,69 @@ class GitAnalyzer:
         
         return "\n".join(summary_lines)
 
-    def analyze_push(self, base_ref: str, head_ref: str) -> Dict[str, Any]:
+    def analyze_push(self, base_ref: str, head_ref: str, compute_summaries: bool = True) -> Dict[str, Any]:
         """
         Analyze a push (multiple commits).
         
         Args:
             base_ref: Base reference (before push).
             head_ref: Head reference (after push).
+            compute_summaries: Whether to generate the basic summary of each commit.
             
         Returns:
             Dict containing push analysis results.
         """
-        # Get the range of commits in the push
-        rev_range = f"{base_ref}..{head_ref}"
-        commits = list(self.repo.iter_commits(rev_range))
+        # Get the range of commits in the push, walking base..head natively
+        walker = self.repo.walk(self._resolve_commit(head_ref).id, pygit2.GIT_SORT_TOPOLOGICAL)
+        walker.hide(self._resolve_commit(base_ref).id)
+        
+        # Stop walking once one commit more than the limit is found, skipping
+        # commits processed by an earlier push
+        new_commits = (commit for commit in walker if str(commit.id) not in self._seen)
+        commits = list(islice(new_commits, self.max_commits + 1))
         
         # Limit the number of commits to analyze
         if len(commits) > self.max_commits:
-            logger.warning(f"Limiting analysis to {self.max_commits} of {len(commits)} commits")
+            logger.warning(f"Limiting analysis to the latest {self.max_commits} commits of the push")
             commits = commits[:self.max_commits]
         
-        # Analyze each commit
-        commit_analyses = []
-        all_ticket_ids = set()
+        # Only reading the messages is enough when no commit references a ticket
+        commit_hashes = [str(commit.id) for commit in commits]
+        if not any(self._scan_ticket_ids(commit) for commit in commits):
+            logger.debug("No JIRA tickets referenced, skipping the analysis of the changes")
+            return {
+                'base_ref': base_ref,
+                'head_ref': head_ref,
+                'commits': [
+                    {'hash': commit_hash, 'ticket_ids': [], 'changes': []}
+                    for commit_hash in commit_hashes
+                ],
+                'ticket_ids': [],
+                'summary': f"Push contains {len(commits)} commits without JIRA tickets."
+            }
         
-        for commit in commits:
-            analysis = self.analyze_commit(commit.hexsha)
-            commit_analyses.append(analysis)
-            all_ticket_ids.update(analysis['ticket_ids'])
+        # Analyze each commit, in parallel when there are several
+        analyze_commit = partial(self.analyze_commit, compute_summary=compute_summaries)
+        if len(commit_hashes) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_ANALYSIS_WORKERS, len(commit_hashes))) as executor:
+                commit_analyses = list(executor.map(analyze_commit, commit_hashes))
+        else:
+            commit_analyses = [analyze_commit(commit_hash) for commit_hash in commit_hashes]
         
-        # Generate overall summary
+        # Collect the ticket IDs in order of appearance and the overall totals in one pass
+        all_ticket_ids = {}
         total_files_changed = set()
         total_insertions = 0
         total_deletions = 0
         
         for analysis in commit_analyses:
+            all_ticket_ids.update(dict.fromkeys(analysis['ticket_ids']))
             for change in analysis['changes']:
-                total_files_changed.add(change['path'])
-                total_insertions += change['insertions']
-                total_deletions += change['deletions']
+                total_files_changed.add(change.path)
+                total_insertions += change.insertions
+                total_deletions += change.deletions
         
+        # Generate overall summary
         summary = f"Push contains {len(commits)} commits affecting {len(total_files_changed)} files " \
                  f"with {total_insertions} additions and {total_deletions} deletions."
         
@@ -244,6 +433,42 @@ class GitAnalyzer:
             'summary': summary
         }
 
+    def stream_commits(self, base_ref: str, head_ref: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the commits of a push together with their diffs.
+        
+        All commits and their patches are read with a single git log call
+        instead of one git call per commit and file. Like analyze_push, only
+        the latest max_commits commits are included.
+        
+        Args:
+            base_ref: Base reference (before push).
+            head_ref: Head reference (after push).
+            
+        Yields:
+            Dicts with the commit 'hash', 'message' and 'files', a dict
+            mapping file paths to their raw diff. Nothing is yielded if git fails.
+        """
+        # Fields are separated by NUL bytes, which cannot occur in text patches
+        cmd = [
+            'git', *PATCH_CONFIG, 'log', '--reverse', '--patch', *PATCH_OPTIONS,
+            f'--max-count={self.max_commits}', '--format=%x00%H%x00%B%x00',
+            f'{base_ref}..{head_ref}'
+        ]
+        try:
+            result = subprocess.run(cmd, cwd=self.repo_path, capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error reading commits {base_ref}..{head_ref}: {e}")
+            return
+        
+        fields = result.stdout.split(b'\0')
+        for i in range(1, len(fields) - 2, 3):
+            yield {
+                'hash': fields[i].decode('ascii').strip(),
+                'message': fields[i + 1].decode('utf-8', 'replace'),
+                'files': split_patch(fields[i + 2])
+            }
+
     def get_commit_url(self, commit_hash: str) -> Optional[str]:
         """
         Get the URL to view a commit in the web interface.
@@ -254,30 +479,31 @@ class GitAnalyzer:
         Returns:
             URL string or None if it cannot be determined.
         """
+        if self._commit_url_prefix is None:
+            return None
+        return self._commit_url_prefix + commit_hash
+
+    @cached_property
+    def _commit_url_prefix(self) -> Optional[str]:
+        """
+        Commit URL without the commit hash, parsed once from the origin remote.
+        
+        Returns:
+            URL prefix or None if it cannot be determined.
+        """
         try:
             # Try to get the remote URL
-            remote_url = self.repo.remotes.origin.url
-            
-            # Handle different remote URL formats
-            if remote_url.startswith('git@github.com:'):
-                # GitHub SSH format
-                repo_path = remote_url.split('git@github.com:')[1].replace('.git', '')
-                return f"https://github.com/{repo_path}/commit/{commit_hash}"
-            elif 'github.com' in remote_url:
-                # GitHub HTTPS format
-                repo_path = remote_url.split('github.com/')[1].replace('.git', '')
-                return f"https://github.com/{repo_path}/commit/{commit_hash}"
-            elif 'gitlab.com' in remote_url:
-                # GitLab format
-                repo_path = remote_url.split('gitlab.com/')[1].replace('.git', '')
-                return f"https://gitlab.com/{repo_path}/-/commit/{commit_hash}"
-            elif 'bitbucket.org' in remote_url:
-                # Bitbucket format
-                repo_path = remote_url.split('bitbucket.org/')[1].replace('.git', '')
-                return f"https://bitbucket.org/{repo_path}/commits/{commit_hash}"
-            else:
-                logger.warning(f"Could not determine commit URL format for remote: {remote_url}")
-                return None
+            remote_url = self.repo.remotes['origin'].url
         except Exception as e:
             logger.warning(f"Error determining commit URL: {e}")
-            return None 
\ No newline at end of file
+            return None
+        
+        # Handle the SSH, scp-like and HTTPS remote URL formats alike
+        match = _REMOTE_URL_RE.match(remote_url)
+        host = (match.group(1) or match.group(2)).lower() if match else None
+        template = _COMMIT_URL_TEMPLATES.get(host)
+        if template is None:
+            logger.warning(f"Could not determine commit URL format for remote: {remote_url}")
+            return None
+        
+        return template.format(repo=match.group(3))
@@ -0,0 +1,50 @@
+"""
+Patch splitting helpers for JIRA Update Hook.
+"""
+
+import codecs
+import re
+from typing import Dict
+
+# Options for git commands whose patches are split with split_patch. They
+# override user settings (diff.noprefix, diff.mnemonicPrefix, color.ui,
+# external diff tools) that would change the headers split_patch expects,
+# and diff merges against their first parent like GitAnalyzer.analyze_commit
+# instead of printing nothing or a combined diff.
+PATCH_OPTIONS = [
+    '--no-color', '--no-ext-diff', '--src-prefix=a/', '--dst-prefix=b/',
+    '--diff-merges=first-parent'
+]
+
+# Git config for those commands: only quote paths with control characters,
+# quotes or backslashes, not every non-ASCII path
+PATCH_CONFIG = ['-c', 'core.quotePath=false']
+
+# Header that starts each file's section in a multi-file patch. Paths with
+# special characters are C-quoted by git, e.g. "b/tab\there".
+DIFF_HEADER_RE = re.compile(
+    rb'^diff --git (?:"a/(?:[^"\\]|\\.)*"|a/.+?) (?:"b/((?:[^"\\]|\\.)*)"|b/(.+))$',
+    re.MULTILINE
+)
+
+
+def split_patch(patch: bytes) -> Dict[str, bytes]:
+    """
+    Split a multi-file patch into per-file sections.
+    
+    Args:
+        patch: Raw patch output of git.
+        
+    Returns:
+        Dict mapping file paths (the post-change path for renames) to their raw diff.
+    """
+    headers = list(DIFF_HEADER_RE.finditer(patch))
+    diffs = {}
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(patch)
+        quoted_path, path = header.groups()
+        if quoted_path is not None:
+            path = codecs.escape_decode(quoted_path)[0]
+        diffs[path.decode('utf-8', 'replace')] = patch[header.start():end]
+    
+    return diffs
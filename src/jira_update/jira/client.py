@@ -3,16 +3,24 @@ JIRA API client for JIRA Update Hook.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterable
 import re
+import fnmatch
 
 from jira import JIRA
+from requests.adapters import HTTPAdapter
 from jira.exceptions import JIRAError
 
 from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Issue fields needed for the issue details and for updating labels
+ISSUE_FIELDS = 'summary,description,status,issuetype,assignee,reporter,priority,labels,components'
+
+# Keep-alive connections kept open to the JIRA server, enough for the concurrent ticket updates
+HTTP_POOL_SIZE = 16
+
 
 class JiraClient:
     """Client for interacting with JIRA API."""
@@ -20,7 +28,31 @@ class JiraClient:
     def __init__(self):
         """Initialize the JIRA client using configuration settings."""
         self.config = get_config()
+        self.jira_url = self.config.get('jira', 'url')
         self.jira = self._create_jira_client()
+        self._configure_session()
+        self._label_patterns = self._compile_label_patterns()
+        
+        # Issues fetched by get_issues, reused by add_labels
+        self._issues = {}
+
+    def _compile_label_patterns(self) -> List[Tuple[str, re.Pattern]]:
+        """
+        Compile the configured file patterns into one regex per label.
+        
+        Returns:
+            List of (label, compiled regex) tuples.
+        """
+        labels_config = self.config.get('comment', 'labels', {}) or {}
+        
+        patterns_by_label = {}
+        for pattern, label in labels_config.items():
+            patterns_by_label.setdefault(label, []).append(fnmatch.translate(pattern))
+        
+        return [
+            (label, re.compile('|'.join(patterns)))
+            for label, patterns in patterns_by_label.items()
+        ]
 
     def _create_jira_client(self) -> JIRA:
         """
@@ -80,6 +112,18 @@ class JiraClient:
             logger.error(f"JIRA authentication error: {e}")
             raise Exception(f"Failed to authenticate with JIRA: {e}")
 
+    def _configure_session(self) -> None:
+        """
+        Size the connection pool of the JIRA HTTP session.
+        
+        All requests share the session of the JIRA client, so connections are
+        reused across calls and threads. Failed requests are already retried by
+        the session of the jira library.
+        """
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.jira._session.mount('https://', adapter)
+        self.jira._session.mount('http://', adapter)
+
     def get_issue(self, issue_key: str) -> Optional[Dict[str, Any]]:
         """
         Get details of a JIRA issue.
@@ -93,23 +137,8 @@ class JiraClient:
         try:
             issue = self.jira.issue(issue_key)
             
-            # Extract relevant issue details
-            issue_dict = {
-                'key': issue.key,
-                'summary': issue.fields.summary,
-                'description': issue.fields.description,
-                'status': issue.fields.status.name,
-                'issue_type': issue.fields.issuetype.name,
-                'assignee': issue.fields.assignee.displayName if issue.fields.assignee else None,
-                'reporter': issue.fields.reporter.displayName if issue.fields.reporter else None,
-                'priority': issue.fields.priority.name if hasattr(issue.fields, 'priority') and issue.fields.priority else None,
-                'labels': issue.fields.labels,
-                'components': [c.name for c in issue.fields.components] if hasattr(issue.fields, 'components') else [],
-                'url': f"{self.config.get('jira', 'url')}/browse/{issue.key}"
-            }
-            
             logger.debug(f"Retrieved JIRA issue: {issue_key}")
-            return issue_dict
+            return self._issue_to_dict(issue)
             
         except JIRAError as e:
             if e.status_code == 404:
@@ -122,6 +151,77 @@ class JiraClient:
             logger.error(f"Unexpected error retrieving JIRA issue {issue_key}: {e}")
             return None
 
+    def get_issues(self, issue_keys: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get details of several JIRA issues with a single JQL search.
+        
+        Falls back to one request per issue if the search fails.
+        
+        Args:
+            issue_keys: JIRA issue keys (e.g., PROJECT-123).
+            
+        Returns:
+            Dict mapping issue keys to issue details. Issues that do not exist
+            are missing from the result. None if the issues could not be
+            looked up, e.g. because JIRA is unavailable.
+        """
+        if not issue_keys:
+            return {}
+        
+        jql = "key in ({})".format(', '.join(f'"{key}"' for key in issue_keys))
+        try:
+            # Without query validation unknown keys are dropped instead of failing the search
+            issues = self.jira.search_issues(
+                jql, maxResults=len(issue_keys), validate_query=False, fields=ISSUE_FIELDS
+            )
+        except JIRAError as e:
+            logger.warning(f"Error searching JIRA issues, retrieving them one by one: {e}")
+            issue_dicts = {}
+            for issue_key in issue_keys:
+                try:
+                    issue = self.jira.issue(issue_key, fields=ISSUE_FIELDS)
+                except JIRAError as e:
+                    if e.status_code == 404:
+                        logger.warning(f"JIRA issue not found: {issue_key}")
+                        continue
+                    logger.error(f"Error retrieving JIRA issue {issue_key}: {e}")
+                    return None
+                self._issues[issue.key] = issue
+                issue_dicts[issue_key] = self._issue_to_dict(issue)
+            return issue_dicts
+        
+        issue_dicts = {}
+        for issue in issues:
+            self._issues[issue.key] = issue
+            issue_dicts[issue.key] = self._issue_to_dict(issue)
+        
+        logger.debug(f"Retrieved {len(issue_dicts)} of {len(issue_keys)} JIRA issues")
+        return issue_dicts
+
+    def _issue_to_dict(self, issue) -> Dict[str, Any]:
+        """
+        Extract the relevant details of a JIRA issue.
+        
+        Args:
+            issue: JIRA issue resource.
+            
+        Returns:
+            Dict containing issue details.
+        """
+        return {
+            'key': issue.key,
+            'summary': issue.fields.summary,
+            'description': issue.fields.description,
+            'status': issue.fields.status.name,
+            'issue_type': issue.fields.issuetype.name,
+            'assignee': issue.fields.assignee.displayName if issue.fields.assignee else None,
+            'reporter': issue.fields.reporter.displayName if issue.fields.reporter else None,
+            'priority': issue.fields.priority.name if hasattr(issue.fields, 'priority') and issue.fields.priority else None,
+            'labels': issue.fields.labels,
+            'components': [c.name for c in issue.fields.components] if hasattr(issue.fields, 'components') else [],
+            'url': f"{self.jira_url}/browse/{issue.key}"
+        }
+
     def add_comment(self, issue_key: str, comment: str) -> bool:
         """
         Add a comment to a JIRA issue.
@@ -148,6 +248,8 @@ class JiraClient:
         """
         Add labels to a JIRA issue.
         
+        Issues already fetched by get_issues are updated without fetching them again.
+        
         Args:
             issue_key: JIRA issue key (e.g., PROJECT-123).
             labels: List of labels to add.
@@ -156,13 +258,16 @@ class JiraClient:
             True if the labels were added successfully, False otherwise.
         """
         try:
-            issue = self.jira.issue(issue_key)
+            issue = self._issues.get(issue_key) or self.jira.issue(issue_key, fields='labels')
             
             # Get existing labels
             existing_labels = issue.fields.labels
             
             # Add new labels (avoid duplicates)
             new_labels = list(set(existing_labels + labels))
+            if len(new_labels) == len(existing_labels):
+                logger.debug(f"JIRA issue {issue_key} already has labels: {', '.join(labels)}")
+                return True
             
             # Update the issue
             issue.update(fields={'labels': new_labels})
@@ -176,25 +281,24 @@ class JiraClient:
             logger.error(f"Unexpected error adding labels to JIRA issue {issue_key}: {e}")
             return False
 
-    def get_labels_for_files(self, file_paths: List[str]) -> List[str]:
+    def get_labels_for_files(self, file_paths: Iterable[str]) -> List[str]:
         """
         Get JIRA labels for file types based on configuration.
         
         Args:
-            file_paths: List of file paths.
+            file_paths: File paths.
             
         Returns:
             List of labels to add.
         """
-        labels_config = self.config.get('comment', 'labels', {})
-        if not labels_config:
+        if not self._label_patterns:
             return []
         
         labels = set()
         
         for file_path in file_paths:
-            for pattern, label in labels_config.items():
-                if re.match(pattern.replace('*', '.*'), file_path):
+            for label, pattern in self._label_patterns:
+                if label not in labels and pattern.match(file_path):
                     labels.add(label)
         
         return list(labels) 
\ No newline at end of file
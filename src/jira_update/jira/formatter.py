@@ -11,6 +11,9 @@ from ..utils.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Template placeholders such as {author}; captured so re.split keeps them
+TEMPLATE_FIELD_RE = re.compile(r'(\{\w+\})')
+
 
 class CommentFormatter:
     """Formats code analysis results into JIRA comments."""
@@ -36,6 +39,9 @@ h3. Files Changed
 
 [View full changes|{commit_url}]
 """
+        
+        # Split the template once: placeholders end up at the odd indices
+        self._template_parts = TEMPLATE_FIELD_RE.split(self.template)
 
     def format_commit_comment(self, commit_analysis: Dict[str, Any]) -> str:
         """
@@ -54,12 +60,7 @@ h3. Files Changed
         author = commit_analysis.get('author', '').split('<')[0].strip()
         
         # Format date
-        date_str = commit_analysis.get('date', '')
-        try:
-            date_obj = datetime.fromisoformat(date_str)
-            date = date_obj.strftime('%Y-%m-%d %H:%M:%S')
-        except (ValueError, TypeError):
-            date = date_str
+        date = self._format_date(commit_analysis.get('date', ''))
         
         # Get summary
         if 'detailed_summary' in commit_analysis:
@@ -75,17 +76,20 @@ h3. Files Changed
         # Get commit URL
         commit_url = commit_analysis.get('commit_url', '#')
         
-        # Replace template variables
-        comment = self.template
-        comment = comment.replace('{commit_hash}', short_hash)
-        comment = comment.replace('{commit_message}', commit_message)
-        comment = comment.replace('{author}', author)
-        comment = comment.replace('{date}', date)
-        comment = comment.replace('{summary}', summary)
-        comment = comment.replace('{files_changed}', files_changed)
-        comment = comment.replace('{commit_url}', commit_url)
-        
-        return comment
+        # Replace template variables, leaving unknown placeholders (e.g. JIRA {code} markup) as they are
+        values = {
+            '{commit_hash}': short_hash,
+            '{commit_message}': commit_message,
+            '{author}': author,
+            '{date}': date,
+            '{summary}': summary,
+            '{files_changed}': files_changed,
+            '{commit_url}': commit_url,
+        }
+        parts = self._template_parts[:]
+        parts[1::2] = [values.get(field, field) for field in parts[1::2]]
+        
+        return ''.join(parts)
 
     def format_push_comment(self, push_analysis: Dict[str, Any]) -> str:
         """
@@ -119,39 +123,59 @@ h3. Files Changed
         
         # Add commit list
         comment_lines.append("h3. Commits")
-        for commit in commits:
-            hash_short = commit.get('hash', '')[:7]
-            message = commit.get('message', '').split('\n')[0]  # First line only
-            author = commit.get('author', '').split('<')[0].strip()
-            
-            # Format date
-            date_str = commit.get('date', '')
-            try:
-                date_obj = datetime.fromisoformat(date_str)
-                date = date_obj.strftime('%Y-%m-%d %H:%M:%S')
-            except (ValueError, TypeError):
-                date = date_str
-            
-            commit_url = commit.get('commit_url', '#')
-            
-            comment_lines.append(f"* [{hash_short}|{commit_url}] - {message} - by {author} on {date}")
+        comment_lines.extend(self._format_commit_line(commit) for commit in commits)
         
         # Add detailed file changes
         comment_lines.append("")
         comment_lines.append("h3. File Changes")
         
         # Collect all changed files
-        all_files = set()
-        for commit in commits:
-            for change in commit.get('changes', []):
-                all_files.add(change.get('path', ''))
+        all_files = {
+            change.path
+            for commit in commits
+            for change in commit.get('changes', ())
+        }
         
         # List files
-        for file_path in sorted(all_files):
-            comment_lines.append(f"* {file_path}")
+        comment_lines.extend(f"* {file_path}" for file_path in sorted(all_files))
         
         return "\n".join(comment_lines)
 
+    def _format_commit_line(self, commit: Dict[str, Any]) -> str:
+        """
+        Format the line of a commit in the commit list of a push comment.
+        
+        Args:
+            commit: Dict containing commit analysis.
+            
+        Returns:
+            Formatted commit line.
+        """
+        get = commit.get
+        hash_short = get('hash', '')[:7]
+        message = get('message', '').split('\n', 1)[0]  # First line only
+        author = get('author', '').split('<', 1)[0].strip()
+        date = self._format_date(get('date', ''))
+        commit_url = get('commit_url', '#')
+        
+        return f"* [{hash_short}|{commit_url}] - {message} - by {author} on {date}"
+
+    @staticmethod
+    def _format_date(date_str: str) -> str:
+        """
+        Format an ISO date for a comment.
+        
+        Args:
+            date_str: Date in ISO format.
+            
+        Returns:
+            Formatted date, or the input unchanged if it is not an ISO date.
+        """
+        try:
+            return datetime.fromisoformat(date_str).strftime('%Y-%m-%d %H:%M:%S')
+        except (ValueError, TypeError):
+            return date_str
+
     def _format_files_changed(self, commit_analysis: Dict[str, Any]) -> str:
         """
         Format the list of files changed in a commit.
@@ -173,10 +197,8 @@ h3. Files Changed
         else:
             # Fall back to basic changes list
             for change in commit_analysis.get('changes', []):
-                path = change.get('path', '')
-                change_type = change.get('type', 'modified')
-                insertions = change.get('insertions', 0)
-                deletions = change.get('deletions', 0)
+                path, change_type = change.path, change.type
+                insertions, deletions = change.insertions, change.deletions
                 
                 if change_type == 'added':
                     file_lines.append(f"* {path} - Added ({insertions} lines)")
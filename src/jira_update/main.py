@@ -7,16 +7,48 @@ import sys
 import logging
 import argparse
 from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 from .git.analyzer import GitAnalyzer
 from .jira.client import JiraClient
 from .jira.formatter import CommentFormatter
 from .analysis.code_analyzer import CodeAnalyzer
-from .utils.config import get_config
+from .utils.config import get_config, ConfigError
 from .utils.logging import setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of JIRA tickets updated concurrently
+MAX_TICKET_WORKERS = 8
+
+
+def update_ticket(ticket_id: str, comment: str, labels: List[str], jira_client: JiraClient) -> bool:
+    """
+    Add the push comment and labels to a JIRA ticket.
+    
+    Args:
+        ticket_id: JIRA ticket ID.
+        comment: Formatted comment for the push.
+        labels: Labels to add to the ticket, if any.
+        jira_client: JIRA client shared by all tickets.
+        
+    Returns:
+        True if the comment and labels were added, False otherwise.
+    """
+    # Add comment to ticket
+    success = jira_client.add_comment(ticket_id, comment)
+    if not success:
+        logger.error(f"Failed to add comment to JIRA ticket: {ticket_id}")
+        return False
+    
+    # Add labels if configured
+    if labels and not jira_client.add_labels(ticket_id, labels):
+        logger.error(f"Failed to add labels to JIRA ticket: {ticket_id}")
+        return False
+    
+    logger.info(f"Successfully updated JIRA ticket: {ticket_id}")
+    return True
+
 
 def process_push(base_ref: str, head_ref: str, repo_path: Optional[str] = None) -> bool:
     """
@@ -42,58 +74,80 @@ def process_push(base_ref: str, head_ref: str, repo_path: Optional[str] = None)
         jira_client = JiraClient()
         comment_formatter = CommentFormatter()
         
-        # Analyze the push
-        push_analysis = git_analyzer.analyze_push(base_ref, head_ref)
+        # Analyze the push, the code analyzer replaces the basic commit summaries
+        push_analysis = git_analyzer.analyze_push(base_ref, head_ref, compute_summaries=False)
         logger.info(f"Found {len(push_analysis['ticket_ids'])} JIRA tickets in commits")
         
         # If no tickets found, exit
         if not push_analysis['ticket_ids']:
             logger.info("No JIRA tickets found in commits. Exiting.")
+            git_analyzer.mark_processed(commit['hash'] for commit in push_analysis['commits'])
             return True
         
         # Add commit URLs
         for commit in push_analysis['commits']:
             commit['commit_url'] = git_analyzer.get_commit_url(commit['hash'])
         
+        # Read the diffs of all commits with a single git call
+        push_diffs = {
+            commit['hash']: commit['files']
+            for commit in git_analyzer.stream_commits(base_ref, head_ref)
+        }
+        
         # Enhance analysis with code insights
         enhanced_commits = []
         for commit in push_analysis['commits']:
+            if commit['hash'] in push_diffs:
+                commit['file_diffs'] = push_diffs[commit['hash']]
             enhanced_commit = code_analyzer.analyze_changes(commit)
             enhanced_commits.append(enhanced_commit)
         
         push_analysis['commits'] = enhanced_commits
         
-        # Process each ticket
+        # Get the details of all tickets with a single request
+        tickets = jira_client.get_issues(push_analysis['ticket_ids'])
+        if tickets is None:
+            logger.error("Could not look up the JIRA tickets, the push will be processed again next time")
+            return False
+        
+        # Update the tickets concurrently, each one only waits on JIRA
+        found_ticket_ids = []
         for ticket_id in push_analysis['ticket_ids']:
-            # Get ticket details
-            ticket = jira_client.get_issue(ticket_id)
-            if not ticket:
+            if ticket_id in tickets:
+                found_ticket_ids.append(ticket_id)
+            else:
                 logger.warning(f"Could not find JIRA ticket: {ticket_id}")
-                continue
-            
-            # Format comment
+        
+        results = []
+        if found_ticket_ids:
+            # The comment and labels are the same for every ticket of the push
             comment = comment_formatter.format_push_comment(push_analysis)
             
-            # Add comment to ticket
-            success = jira_client.add_comment(ticket_id, comment)
-            if not success:
-                logger.error(f"Failed to add comment to JIRA ticket: {ticket_id}")
-                continue
-            
-            # Add labels if configured
+            labels = []
             if get_config().get('comment', 'add_labels', False):
-                # Collect all file paths
-                file_paths = []
-                for commit in push_analysis['commits']:
-                    for change in commit.get('changes', []):
-                        file_paths.append(change.get('path', ''))
+                # Collect the unique file paths, files changed by several commits are matched once
+                file_paths = {
+                    change.path
+                    for commit in push_analysis['commits']
+                    for change in commit.get('changes', ())
+                }
                 
                 # Get labels for files
                 labels = jira_client.get_labels_for_files(file_paths)
-                if labels:
-                    jira_client.add_labels(ticket_id, labels)
             
-            logger.info(f"Successfully updated JIRA ticket: {ticket_id}")
+            with ThreadPoolExecutor(max_workers=min(MAX_TICKET_WORKERS, len(found_ticket_ids))) as executor:
+                results = list(executor.map(
+                    lambda ticket_id: update_ticket(ticket_id, comment, labels, jira_client),
+                    found_ticket_ids
+                ))
+            logger.info(f"Updated {sum(results)} of {len(found_ticket_ids)} JIRA tickets")
+        
+        # Only skip the commits in later runs once every ticket has been updated
+        if not all(results):
+            logger.error("Some JIRA tickets were not updated, the push will be processed again next time")
+            return False
+        
+        git_analyzer.mark_processed(commit['hash'] for commit in push_analysis['commits'])
         
         logger.info("Push processing completed successfully")
         return True
@@ -103,6 +157,30 @@ def process_push(base_ref: str, head_ref: str, repo_path: Optional[str] = None)
         return False
 
 
+def main_hook(base_ref: str, head_ref: str, repo_path: Optional[str] = None,
+              config_path: Optional[str] = None) -> int:
+    """
+    Entry point for the installed Git hooks.
+    
+    Args:
+        base_ref: Base reference (before push).
+        head_ref: Head reference (after push).
+        repo_path: Path to the Git repository. If None, uses the current directory.
+        config_path: Path to the configuration file. If None, uses the default path.
+        
+    Returns:
+        Exit code for the hook.
+    """
+    try:
+        # Load the configuration so every component uses this file
+        get_config(config_path)
+    except ConfigError as e:
+        logger.error(f"Error loading configuration: {e}")
+        return 1
+    
+    return 0 if process_push(base_ref, head_ref, repo_path) else 1
+
+
 def main():
     """Main entry point for the command-line interface."""
     parser = argparse.ArgumentParser(description='JIRA Update Hook')
@@ -116,6 +194,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Load the configuration so every component uses this file
+    get_config(args.config)
+    
     # Set up logging
     setup_logging(args.log_level, args.log_file)
     
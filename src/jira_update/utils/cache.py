@@ -0,0 +1,57 @@
+"""
+Cache location and file helpers for JIRA Update Hook.
+"""
+
+import hashlib
+import os
+
+
+def get_cache_dir(*parts: str) -> str:
+    """
+    Get the path of a directory in the user cache directory.
+    
+    The directory lives under $XDG_CACHE_HOME/jira_update (~/.cache/jira_update
+    by default). It is not created, writers are expected to create it.
+    
+    Args:
+        parts: Sub-directory components below the cache directory.
+        
+    Returns:
+        Absolute path of the directory.
+    """
+    base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_dir, 'jira_update', *parts)
+
+
+def cache_key(path: str) -> str:
+    """
+    Get a short, file name safe key identifying a path in the cache.
+    
+    Args:
+        path: Normalized path, e.g. an absolute or real path.
+        
+    Returns:
+        Hex digest of the path.
+    """
+    return hashlib.sha1(path.encode()).hexdigest()[:16]
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Write a cache file atomically, creating its directory if needed.
+    
+    The data is written to a temporary file that replaces the cache file, so
+    concurrent hooks never read a partial file.
+    
+    Args:
+        path: Path of the cache file.
+        data: Contents of the file.
+        
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, path)
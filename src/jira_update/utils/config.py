@@ -3,21 +3,176 @@ Configuration module for JIRA Update Hook.
 """
 
 import os
+import copy
+import pickle
 import yaml
 import logging
-from typing import Dict, Any, Optional
-import keyring
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Iterator
+
+from .cache import atomic_write, cache_key, get_cache_dir
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG_PATH = "config.yaml"
 
+# libyaml-backed loader when PyYAML was built with it, same safety as SafeLoader
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Sections every configuration must have
+REQUIRED_SECTIONS = frozenset({'jira', 'project', 'git'})
+
+# Fields required for JIRA OAuth authentication
+REQUIRED_OAUTH_FIELDS = frozenset({'access_token', 'access_token_secret', 'consumer_key', 'key_cert'})
+
+# Settings read by Config.load_header, by section
+HEADER_FIELDS = {'jira': 'url', 'project': 'keys'}
+
+# Event-level parser for load_header, all scalars are read as strings
+YAML_BASE_LOADER = getattr(yaml, 'CBaseLoader', yaml.BaseLoader)
+
+# Plain scalars the safe loader resolves to None
+_NULL_SCALARS = frozenset({'~', 'null', 'Null', 'NULL', ''})
+
+# JIRA settings holding secrets, configurations with them are never cached on disk
+SECRET_JIRA_FIELDS = frozenset({'password', 'oauth'})
+
 
 class ConfigError(Exception):
     """Exception raised for configuration errors."""
     pass
 
 
+@lru_cache(maxsize=None)
+def _load_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a YAML file, memoized on its path and modification time.
+    
+    Args:
+        path: Absolute path to the YAML file.
+        mtime_ns: Modification time of the file, so edits invalidate the cache.
+        
+    Returns:
+        Parsed YAML content. Callers must not mutate the returned object.
+    """
+    # Hand the loader one contiguous buffer, libyaml decodes it itself
+    return yaml.load(Path(path).read_bytes(), Loader=YAML_LOADER)
+
+
+@lru_cache(maxsize=32)
+def _get_keyring_password(service: str, username: str) -> Optional[str]:
+    """
+    Look up a password in the keyring, memoized to avoid repeated keychain round-trips.
+    
+    Args:
+        service: Keyring service name.
+        username: Username or identifier.
+        
+    Returns:
+        Stored password or None if there is none.
+    """
+    # Imported lazily, loading the keyring backends is slow and most setups don't use it
+    import keyring
+    
+    return keyring.get_password(service, username)
+
+
+def _scalar_value(event: yaml.ScalarEvent) -> Optional[str]:
+    """
+    Get the value of a scalar event, resolving plain YAML nulls to None.
+    
+    Args:
+        event: Scalar event from the base loader's parser.
+        
+    Returns:
+        The scalar string, or None for `~`, `null` and empty plain scalars.
+    """
+    if event.implicit[0] and event.value in _NULL_SCALARS:
+        return None
+    return event.value
+
+
+def _skip_node(events: Iterator[yaml.Event], event: yaml.Event):
+    """
+    Consume the remaining events of a YAML node.
+    
+    Args:
+        events: Parser event stream.
+        event: First event of the node.
+    """
+    if not isinstance(event, yaml.CollectionStartEvent):
+        return
+    
+    depth = 1
+    while depth:
+        event = next(events)
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+
+
+def _scan_header(events: Iterator[yaml.Event]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Extract the HEADER_FIELDS settings from a YAML event stream.
+    
+    Stops consuming events as soon as all settings have been found.
+    
+    Args:
+        events: Parser event stream.
+        
+    Returns:
+        Dict of the settings by section, or None if they could not all be
+        read from the events (e.g. missing or given through aliases).
+    """
+    # Find the top-level mapping
+    for event in events:
+        if isinstance(event, yaml.MappingStartEvent):
+            break
+    else:
+        return None
+    
+    header = {}
+    for key_event in events:
+        if not isinstance(key_event, yaml.ScalarEvent):
+            return None
+        value_event = next(events)
+        field = HEADER_FIELDS.get(key_event.value)
+        if field is None or not isinstance(value_event, yaml.MappingStartEvent):
+            _skip_node(events, value_event)
+            continue
+        
+        # Read the wanted setting of the section and skip everything else
+        section = header.setdefault(key_event.value, {})
+        for section_key_event in events:
+            if isinstance(section_key_event, yaml.MappingEndEvent):
+                break
+            if not isinstance(section_key_event, yaml.ScalarEvent):
+                return None
+            section_value_event = next(events)
+            if section_key_event.value != field:
+                _skip_node(events, section_value_event)
+            elif isinstance(section_value_event, yaml.ScalarEvent):
+                section[field] = _scalar_value(section_value_event)
+            elif isinstance(section_value_event, yaml.SequenceStartEvent):
+                items = []
+                for item_event in events:
+                    if isinstance(item_event, yaml.SequenceEndEvent):
+                        break
+                    if not isinstance(item_event, yaml.ScalarEvent):
+                        return None
+                    items.append(_scalar_value(item_event))
+                section[field] = items
+            else:
+                return None
+            
+            if all(header.get(name, {}).get(key) is not None for name, key in HEADER_FIELDS.items()):
+                return header
+    
+    return None
+
+
 class Config:
     """Configuration handler for JIRA Update Hook."""
 
@@ -29,10 +184,71 @@ class Config:
             config_path: Path to the configuration file. If None, uses default path.
         """
         self.config_path = config_path or DEFAULT_CONFIG_PATH
-        self.config = self._load_config()
-        self._validate_config()
+        
+        # Reuse the validated configuration from an earlier run if the file is unchanged
+        self.config = self._load_cached_config()
+        if self.config is None:
+            self.config = self._load_config()
+            self._validate_config()
+            self._save_cached_config()
+        
         self._setup_credentials()
 
+    def _get_cache_key(self) -> Tuple[str, Tuple[str, int, int]]:
+        """
+        Get the disk cache file and key of the configuration file.
+        
+        Returns:
+            Tuple of the cache file path and the (path, mtime, size) key.
+            
+        Raises:
+            OSError: If the configuration file cannot be accessed.
+        """
+        path = os.path.abspath(self.config_path)
+        stat = os.stat(path)
+        cache_name = cache_key(path) + '.pkl'
+        return os.path.join(get_cache_dir('config'), cache_name), (path, stat.st_mtime_ns, stat.st_size)
+
+    def _load_cached_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the validated configuration cached by an earlier run.
+        
+        Returns:
+            Dict containing configuration settings, or None if there is no
+            up to date cache entry.
+        """
+        try:
+            cache_file, key = self._get_cache_key()
+            with open(cache_file, 'rb') as f:
+                cached_key, config = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug("Ignoring unreadable configuration cache: %s", e)
+            return None
+        
+        if cached_key != key:
+            return None
+        
+        logger.debug("Loaded cached configuration for %s", self.config_path)
+        return config
+
+    def _save_cached_config(self):
+        """
+        Cache the validated configuration on disk for later runs.
+        
+        Configurations holding secrets are not cached, credentials only ever
+        come from the configuration file or the keyring.
+        """
+        if SECRET_JIRA_FIELDS & self.config['jira'].keys():
+            return
+        
+        try:
+            cache_file, key = self._get_cache_key()
+            atomic_write(cache_file, pickle.dumps((key, self.config), protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            logger.debug("Could not write configuration cache: %s", e)
+
     def _load_config(self) -> Dict[str, Any]:
         """
         Load configuration from YAML file.
@@ -44,10 +260,11 @@ class Config:
             ConfigError: If the configuration file cannot be loaded.
         """
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                logger.debug(f"Loaded configuration from {self.config_path}")
-                return config
+            path = os.path.abspath(self.config_path)
+            config = _load_yaml(path, os.stat(path).st_mtime_ns)
+            logger.debug("Loaded configuration from %s", self.config_path)
+            # Return a private copy, credentials are filled in place later on
+            return copy.deepcopy(config)
         except FileNotFoundError:
             raise ConfigError(f"Configuration file not found: {self.config_path}")
         except yaml.YAMLError as e:
@@ -61,10 +278,9 @@ class Config:
             ConfigError: If the configuration is invalid.
         """
         # Check for required sections
-        required_sections = ['jira', 'project', 'git']
-        for section in required_sections:
-            if section not in self.config:
-                raise ConfigError(f"Missing required configuration section: {section}")
+        missing_sections = REQUIRED_SECTIONS - self.config.keys()
+        if missing_sections:
+            raise ConfigError(f"Missing required configuration section: {', '.join(sorted(missing_sections))}")
 
         # Validate JIRA configuration
         jira_config = self.config['jira']
@@ -78,11 +294,9 @@ class Config:
         elif auth_method == 'oauth':
             if 'oauth' not in jira_config:
                 raise ConfigError("Missing OAuth configuration for JIRA")
-            oauth_config = jira_config['oauth']
-            required_oauth_fields = ['access_token', 'access_token_secret', 'consumer_key', 'key_cert']
-            for field in required_oauth_fields:
-                if field not in oauth_config:
-                    raise ConfigError(f"Missing OAuth field in configuration: {field}")
+            missing_fields = REQUIRED_OAUTH_FIELDS - jira_config['oauth'].keys()
+            if missing_fields:
+                raise ConfigError(f"Missing OAuth field in configuration: {', '.join(sorted(missing_fields))}")
         else:
             raise ConfigError(f"Unsupported JIRA authentication method: {auth_method}")
 
@@ -108,11 +322,11 @@ class Config:
             if auth_method == 'basic':
                 # Try to get password from keyring
                 username = jira_config['username']
-                password = keyring.get_password('jira_update', username)
+                password = _get_keyring_password('jira_update', username)
                 
                 if password:
                     jira_config['password'] = password
-                    logger.debug(f"Retrieved JIRA password from keyring for {username}")
+                    logger.debug("Retrieved JIRA password from keyring for %s", username)
                 elif 'password' not in jira_config:
                     raise ConfigError("No JIRA password found in configuration or keyring")
             
@@ -130,13 +344,68 @@ class Config:
         Returns:
             Configuration value or default.
         """
-        if section not in self.config:
+        section_config = self.config.get(section)
+        if section_config is None:
             return default
         
-        if key is None:
-            return self.config[section]
+        return section_config if key is None else section_config.get(key, default)
+
+    @staticmethod
+    def load_header(config_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Read only the JIRA URL and the project keys from a configuration file.
+        
+        The file is parsed as an event stream that stops once both settings
+        have been seen. If they cannot be read that way, the whole file is
+        parsed instead. The configuration is not validated.
+        
+        Args:
+            config_path: Path to the configuration file. If None, uses default path.
+            
+        Returns:
+            Dict like {'jira': {'url': ...}, 'project': {'keys': [...]}}. Missing
+            settings are None.
+            
+        Raises:
+            ConfigError: If the configuration file cannot be loaded.
+        """
+        config_path = config_path or DEFAULT_CONFIG_PATH
+        try:
+            with open(config_path, 'rb') as f:
+                header = _scan_header(iter(yaml.parse(f, Loader=YAML_BASE_LOADER)))
+                if header is None:
+                    # Fall back to a full parse, e.g. for settings given through aliases
+                    f.seek(0)
+                    config = yaml.load(f, Loader=YAML_LOADER)
+        except FileNotFoundError:
+            raise ConfigError(f"Configuration file not found: {config_path}")
+        except yaml.YAMLError as e:
+            raise ConfigError(f"Error parsing configuration file: {e}")
+        
+        if header is None:
+            if not isinstance(config, dict):
+                config = {}
+            header = {
+                name: {key: (config.get(name) or {}).get(key)}
+                for name, key in HEADER_FIELDS.items()
+            }
         
-        return self.config[section].get(key, default)
+        for name, key in HEADER_FIELDS.items():
+            header.setdefault(name, {}).setdefault(key, None)
+        
+        return header
+
+    def get_section(self, section: str) -> Dict[str, Any]:
+        """
+        Get an entire configuration section in a single lookup.
+        
+        Args:
+            section: Configuration section name.
+            
+        Returns:
+            Dict with the section settings, empty if the section is missing.
+        """
+        return self.config.get(section) or {}
 
     def set_credential(self, username: str, password: str):
         """
@@ -149,27 +418,57 @@ class Config:
         use_keyring = self.config.get('advanced', {}).get('use_keyring', False)
         
         if use_keyring:
+            import keyring
+            
             keyring.set_password('jira_update', username, password)
-            logger.debug(f"Stored JIRA password in keyring for {username}")
+            _get_keyring_password.cache_clear()
+            logger.debug("Stored JIRA password in keyring for %s", username)
         else:
             logger.warning("Keyring storage is disabled in configuration")
 
 
-# Singleton instance
-_config_instance = None
+# Path of the configuration used when get_config is called without one
+_active_config_path = None
+
+
+@lru_cache(maxsize=None)
+def _get_cached_config(config_path: str) -> Config:
+    """
+    Load a configuration file once per path.
+    
+    Args:
+        config_path: Absolute path to the configuration file.
+        
+    Returns:
+        Config instance.
+    """
+    return Config(config_path)
 
 
 def get_config(config_path: Optional[str] = None) -> Config:
     """
-    Get the configuration singleton instance.
+    Get the configuration, loading each configuration file only once.
     
     Args:
-        config_path: Optional path to configuration file.
+        config_path: Optional path to configuration file. If None, uses the
+            path of the last explicit call, or the default path.
         
     Returns:
         Config instance.
     """
-    global _config_instance
-    if _config_instance is None:
-        _config_instance = Config(config_path)
-    return _config_instance 
\ No newline at end of file
+    global _active_config_path
+    path = os.path.abspath(config_path or _active_config_path or DEFAULT_CONFIG_PATH)
+    config = _get_cached_config(path)
+    if config_path is not None:
+        _active_config_path = path
+    return config
+
+
+def _clear_config_cache():
+    """Forget all loaded configurations and the active configuration path."""
+    global _active_config_path
+    _active_config_path = None
+    _get_cached_config.cache_clear()
+
+
+get_config.cache_clear = _clear_config_cache
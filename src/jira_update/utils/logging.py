@@ -3,21 +3,51 @@ Logging configuration for JIRA Update Hook.
 """
 
 import os
+import atexit
 import logging
 import logging.handlers
+import queue
 from typing import Optional
 
 from .config import get_config
 
+# Formatters shared by every logging setup
+FILE_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+CONSOLE_FORMATTER = logging.Formatter('%(levelname)s: %(message)s')
+
+# Background listener writing the queued log records to the real handlers
+_listener = None
+
+# (log level, log file) of the current logging setup
+_current_setup = None
+
+
+def _stop_listener() -> None:
+    """Flush the queued log records and close the handlers of the listener."""
+    global _listener
+    if _listener is None:
+        return
+    
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = None) -> None:
     """
     Set up logging for the application.
     
+    Calling it again with the same level and file keeps the current setup.
+    
     Args:
         log_level: Log level (debug, info, warning, error). If None, uses the value from config.
         log_file: Path to log file. If None, uses the value from config.
     """
+    global _listener, _current_setup
     config = get_config()
     
     # Get log level from config if not provided
@@ -31,10 +61,14 @@ def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = Non
     if log_file is None:
         log_file = config.get('advanced', 'log_file', 'jira_update.log')
     
+    # Nothing to do if logging is already set up this way
+    if _current_setup == (log_level, log_file) and _listener is not None:
+        return
+    
     # Create log directory if it doesn't exist
     log_dir = os.path.dirname(log_file)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
     
     # Configure root logger
     root_logger = logging.getLogger()
@@ -43,26 +77,26 @@ def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = Non
     # Remove existing handlers to avoid duplicates
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
+    _stop_listener()
     
     # Set up file handler
     file_handler = logging.handlers.RotatingFileHandler(
         log_file, maxBytes=10*1024*1024, backupCount=5
     )
-    file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
+    file_handler.setFormatter(FILE_FORMATTER)
     
     # Set up console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(CONSOLE_FORMATTER)
+    
+    # Log through a queue so formatting and I/O happen on a background thread
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    _current_setup = (log_level, log_file)
     
     # Log initial message
-    logging.info(f"Logging initialized at level {log_level.upper()}") 
\ No newline at end of file
+    logging.info("Logging initialized at level %s", log_level.upper()) 
\ No newline at end of file